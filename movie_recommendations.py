@@ -9,8 +9,11 @@ train the system and one for testing set to test the system.
 """
 
 import csv
+import warnings
+from collections.abc import Mapping
 
-from scipy.stats import pearsonr
+import numpy as np
+from scipy.sparse import csr_matrix
 
 
 class BadInputError(Exception):
@@ -19,6 +22,59 @@ class BadInputError(Exception):
     pass
 
 
+def rating_similarity(users_i, ratings_i, users_j, ratings_j):
+    """
+    Returns the similarity between two movies, given the sorted
+    ids of the users who rated each movie and the ratings they
+    gave it, in half stars.
+    """
+    # Probes the shorter list of users into the longer one. The similarity is symmetric, so the order does not matter.
+    if len(users_i) > len(users_j):
+        users_i, ratings_i, users_j, ratings_j = users_j, ratings_j, users_i, ratings_i
+    if len(users_i) == 0:
+        return 0.0
+
+    # Binary searches each user of the shorter list in the longer one, which pairs up the users who rated both movies
+    # in a single pass without sorting. If no user rated both, the similarity is zero.
+    positions = np.minimum(np.searchsorted(users_j, users_i), len(users_j) - 1)
+    both = users_j[positions] == users_i
+    if not both.any():
+        return 0.0
+
+    # Sums the absolute differences between the two movies' ratings in half stars, converts their average back to stars,
+    # and maps it to a weighted similarity value. The absolute value is taken in place to avoid another temporary array.
+    differences = np.subtract(ratings_i[both], ratings_j[positions[both]])
+    difference_total = np.abs(differences, out=differences).sum(dtype=np.int64)
+    average_difference = difference_total / (2 * np.count_nonzero(both))
+    return float(1 - average_difference / 4.5)
+
+
+def load_ratings(ratings_filename):
+    """
+    Reads in a ratings file and returns arrays of its user ids,
+    movie ids and ratings.
+    """
+    with open(ratings_filename, "r", encoding="utf-8") as ratings_file:
+        # Skips the first line only if it is the header, which is recognized by its first column.
+        if ratings_file.readline().split(",")[0].strip() != "userId":
+            ratings_file.seek(0)
+
+        # The ids are parsed as integers, so an id that is not a whole number raises a ValueError just like int() does.
+        # A file without any ratings gives empty arrays, so numpy's warning about it is silenced.
+        with warnings.catch_warnings():
+            warnings.filterwarnings(
+                "ignore", message="loadtxt: input contained no data"
+            )
+            ratings = np.loadtxt(
+                ratings_file,
+                delimiter=",",
+                usecols=(0, 1, 2),
+                dtype=[("userId", int), ("movieId", int), ("rating", float)],
+                ndmin=1,
+            )
+    return ratings["userId"], ratings["movieId"], ratings["rating"]
+
+
 class Movie_Recommendations:
     """Represents a movie recommendation system using collobrative filtering."""
 
@@ -33,35 +89,97 @@ class Movie_Recommendations:
         self.user_dict - A dictionary that maps user id's to a
                a dictionary that maps a movie id to the rating
                that the user gave to the movie.
+        self.movie_index - A dictionary that maps a movie id to
+               its column in the ratings matrix.
+        self.movie_ids - An array of the movie ids in the order of
+               their columns in the ratings matrix.
+        self.user_index - A dictionary that maps a user id to
+               its row in the ratings matrix.
+        self.ratings - A sparse (CSR) matrix of ratings, one row
+               per user and one column per movie. Ratings are
+               stored in half stars (twice the rating) as int8.
+        self.ratings_csc - The same ratings matrix in CSC format,
+               for fast access to the ratings of a single movie.
+        self.S - A matrix holding the rows of movie similarities
+               that have been computed so far, in the order they
+               were computed. Each row is indexed by the movies'
+               columns in the ratings matrix.
+        self.similarity_slots - An array that maps a movie's column
+               in the ratings matrix to its row in self.S, or to -1
+               if its row has not been computed.
+        self.similarity_count - The number of rows of self.S that
+               are in use.
         """
         self.movie_dict = {}
         self.user_dict = {}
+        self.movie_index = {}
+        self.user_index = {}
 
         # Reads in data from movies.csv, adds the movie ids into movie_dict which maps to its movie object.
         movie_file = open(movie_filename, "r", encoding="utf-8")
         csv_reader = csv.reader(movie_file, delimiter=",", quotechar='"')
         for line in csv_reader:
             if line[0] != "movieId":
-                self.movie_dict[int(line[0])] = Movie(int(line[0]), line[1])
+                movie_id = int(line[0])
+                # A movie id that appears again keeps its column, and its later row replaces the earlier movie.
+                self.movie_index.setdefault(movie_id, len(self.movie_index))
+                self.movie_dict[movie_id] = Movie(
+                    movie_id, line[1], self, self.movie_index[movie_id]
+                )
         movie_file.close()
 
-        # Reads in data from training_ratings.csv, adds user ids to movie object's users list,
+        # Reads in data from training_ratings.csv as arrays of user ids, movie ids and ratings.
+        user_ids, movie_ids, ratings = load_ratings(training_ratings_filename)
+
+        # Adds user ids to movie object's users set,
         # Adds the user ids into the nested dictionary user_dict, which has a value that maps
         # the movies the user watched to the ratings they gave to that particular movie.
-        rating_placeholder = {}
-        training_file = open(training_ratings_filename, "r", encoding="utf-8")
-        csv_reader = csv.reader(training_file, delimiter=",")
-        for line in csv_reader:
-            if line[0] != "userId":
-                self.movie_dict[int(line[1])].users.append(int(line[0]))
-                if int(line[0]) in self.user_dict:
-
-                    rating_placeholder = self.user_dict[int(line[0])]
-                    rating_placeholder[int(line[1])] = float(line[2])
-                    self.user_dict[int(line[0])] = rating_placeholder
-                else:
-                    self.user_dict[int(line[0])] = {int(line[1]): float(line[2])}
-        training_file.close()
+        for user_id, movie_id, rating in zip(
+            user_ids.tolist(), movie_ids.tolist(), ratings.tolist()
+        ):
+            self.movie_dict[movie_id].users.add(user_id)
+            self.user_dict.setdefault(user_id, {})[movie_id] = rating
+
+        # Numbers the users in order of their ids, and finds the row and column of each rating in the ratings matrix.
+        unique_user_ids, rating_rows = np.unique(user_ids, return_inverse=True)
+        self.user_index = dict(
+            zip(unique_user_ids.tolist(), range(len(unique_user_ids)))
+        )
+        self.movie_ids = np.fromiter(
+            self.movie_index, dtype=int, count=len(self.movie_index)
+        )
+        movie_order = np.argsort(self.movie_ids)
+        rating_columns = movie_order[
+            np.searchsorted(self.movie_ids, movie_ids, sorter=movie_order)
+        ]
+
+        # Converts the ratings to half stars, which only works for ratings that are a multiple of 0.5.
+        half_stars = ratings * 2
+        if np.any(half_stars != np.rint(half_stars)) or np.any(
+            (half_stars < 0) | (half_stars > 10)
+        ):
+            raise ValueError("Ratings must be multiples of 0.5 from 0 to 5.")
+
+        # Builds the sparse ratings matrix. A user who rated a movie twice only keeps their last rating, just like in user_dict.
+        # Every rating is stored explicitly, including ratings of zero, so the stored entries are exactly the rated ones.
+        shape = (len(self.user_index), len(self.movie_index))
+        entries = rating_rows * shape[1] + rating_columns
+        _, last_entries = np.unique(entries[::-1], return_index=True)
+        last_entries = len(entries) - 1 - last_entries
+        self.ratings = csr_matrix(
+            (
+                half_stars[last_entries].astype(np.int8),
+                (rating_rows[last_entries], rating_columns[last_entries]),
+            ),
+            shape=shape,
+        )
+        self.ratings_csc = self.ratings.tocsc()
+
+        # Starts with an empty similarity matrix. Rows are added to it as they are computed, so its size grows with the
+        # number of rows computed rather than with the number of movies.
+        self.S = np.empty((0, shape[1]), dtype=np.float32)
+        self.similarity_slots = np.full(shape[1], -1, dtype=np.intp)
+        self.similarity_count = 0
 
     def predict_rating(self, user_id, movie_id):
         """
@@ -83,21 +201,21 @@ class Movie_Recommendations:
                 return rating
             # If the user has not rated the movie, perform the prediction rating calculation.
             else:
-                # Creates a list of all of the movies that the user rated
-                user_rated_movies = list(self.user_dict[user_id])
                 sim_x_rate_total = 0
                 sim_total = 0
-                # Reads in the rating for each movie from the user_dict and calculates the similarity using the movie dict to access
-                # the movie object's get similarity method.
-                for movie in user_rated_movies:
-                    rating = self.user_dict[user_id]
-                    rating = rating[movie]
-                    similarity = self.movie_dict[movie].get_similarity(
-                        movie_id, self.movie_dict, self.user_dict
+                # Looks up the movie being predicted and the movie dict once, outside of the loop.
+                movie_dict = self.movie_dict
+                predicted_movie = movie_dict[movie_id]
+                # Reads in each movie the user rated along with its rating from the user's ratings and calculates the similarity using
+                # the movie object's get similarity method. The similarity is looked up from movie_id's side so only its row of
+                # similarities has to be computed.
+                for movie, rating in self.user_dict[user_id].items():
+                    similarity = predicted_movie.get_similarity(
+                        movie, movie_dict, self.user_dict
                     )
                     # Now with the user rating and similarity calculation, multiply them. Save this multiplying total and the similarity total.
-                    sim_x_rate_total += float(similarity) * float(rating)
-                    sim_total += float(similarity)
+                    sim_x_rate_total += similarity * rating
+                    sim_total += similarity
 
                 # If the sum of the similarities is zero, the default prediction rating is 2.5
                 if sim_total == 0.0 or sim_total == 0:
@@ -115,34 +233,193 @@ class Movie_Recommendations:
         The tuple should contain
         (user id, movie title, predicted rating, actual rating)
         """
-        # Initializes tuple list
+        # Reads in the user ids, movie ids, and ratings from test_ratings.csv. Checks to see if the user or movie ids are valid,
+        # and if invalid, raises a bad input exception just like predict_rating.
+        user_ids, movie_ids, ratings = load_ratings(test_ratings_filename)
+        test_users = user_ids.tolist()
+        test_movies = movie_ids.tolist()
+        actual_ratings = ratings.tolist()
+        for user_id, movie_id in zip(test_users, test_movies):
+            if user_id not in self.user_dict or movie_id not in self.movie_dict:
+                raise BadInputError
+
+        # Finds each test rating's row and column in the ratings matrix, and computes the similarity rows of all of the
+        # movies being predicted up front.
+        rows = np.array([self.user_index[user_id] for user_id in test_users], dtype=int)
+        columns = np.array(
+            [self.movie_index[movie_id] for movie_id in test_movies], dtype=int
+        )
+        self.compute_similarity_rows(columns)
+
+        # Predicts every test rating at once. Each of a user's ratings is paired with the similarity between the movie
+        # being predicted and the rated movie, and the sums of the similarities and of the similarities multiplied by the
+        # ratings are taken per test rating. The ratings are stored in half stars, so those totals are halved.
+        user_ratings = self.ratings[rows]
+        test_rating_of_entry = np.repeat(
+            np.arange(len(rows)), np.diff(user_ratings.indptr)
+        )
+        similarities = self.S[
+            self.similarity_slots[columns][test_rating_of_entry], user_ratings.indices
+        ].astype(np.float64)
+        sim_x_rate_totals = (
+            np.bincount(
+                test_rating_of_entry,
+                weights=similarities * user_ratings.data,
+                minlength=len(rows),
+            )
+            / 2
+        )
+        sim_totals = np.bincount(
+            test_rating_of_entry, weights=similarities, minlength=len(rows)
+        )
+
+        # If the sum of the similarities is zero, the default prediction rating is 2.5, otherwise the predicted rating is the
+        # rating and similarity multiplication total divided by the similarity total.
+        predicted_ratings = np.divide(
+            sim_x_rate_totals,
+            sim_totals,
+            out=np.full(len(rows), 2.5),
+            where=sim_totals != 0,
+        ).tolist()
+
+        # Builds the tuple list. The first element of the tuple is the user_id, the second element is the movie title which is
+        # read from the movie object's title found in the movie_dict. The third element is the prediction, or the user's own
+        # rating if they already rated the movie. The fourth element is the actual rating which is found in the test_ratings.csv.
         tuple_list = []
-        test_file = open(test_ratings_filename, "r", encoding="utf-8")
-        csv_reader = csv.reader(test_file, delimiter=",")
-        # Reads in the user id, movie id, and ratings from test_ratings.csv and appends data to the tuple list. The first element of the tuple is
-        # the user_id, the second element is the movie title which is read from the movie object's title found in the movie_dict. The third element
-        # is the prediction value that is calculated with the movie object's predict_rating method. The fourth element is the actual rating which is
-        # found in the test_ratings.csv.
-        for line in csv_reader:
-            if line[0] != "userId":
-                tuple_list.append(
-                    (
-                        int(line[0]),
-                        self.movie_dict[int(line[1])].title,
-                        self.predict_rating(int(line[0]), int(line[1])),
-                        float(line[2]),
-                    )
-                )
-        print(type(tuple_list[0]))
+        for user_id, movie_id, predicted_rating, actual_rating in zip(
+            test_users, test_movies, predicted_ratings, actual_ratings
+        ):
+            movie = self.movie_dict[movie_id]
+            if user_id in movie.users:
+                predicted_rating = self.user_dict[user_id][movie_id]
+            tuple_list.append((user_id, movie.title, predicted_rating, actual_rating))
         return tuple_list
 
+    def movie_ratings(self, i):
+        """
+        Returns the sorted rows of the users who rated the movie in
+        column i of the ratings matrix, and the ratings they gave it.
+        """
+        start = self.ratings_csc.indptr[i]
+        end = self.ratings_csc.indptr[i + 1]
+        return self.ratings_csc.indices[start:end], self.ratings_csc.data[start:end]
+
+    def compute_similarity(self, i, j):
+        """
+        Computes and returns the similarity between the movies
+        in columns i and j of the ratings matrix.
+        """
+        return rating_similarity(*self.movie_ratings(i), *self.movie_ratings(j))
+
+    def compute_similarity_row(self, i):
+        """
+        Computes the similarities between the movie in column i of
+        the ratings matrix and every movie, and adds them to self.S
+        as a new row.
+        """
+        # Only the users who rated movie i can contribute to its similarities, so only their rows are scanned.
+        users, ratings = self.movie_ratings(i)
+        user_ratings = self.ratings[users]
+
+        # Sums the absolute differences from movie i's ratings over the users who rated both movies, for every movie at once.
+        # The differences are in half stars, so the totals are halved to get back to stars.
+        differences = np.subtract(
+            user_ratings.data, np.repeat(ratings, np.diff(user_ratings.indptr))
+        )
+        np.abs(differences, out=differences)
+        difference_totals = (
+            np.bincount(
+                user_ratings.indices, weights=differences, minlength=self.S.shape[1]
+            )
+            / 2
+        )
+        counts = np.bincount(user_ratings.indices, minlength=self.S.shape[1])
+
+        # Movies that no user rated along with movie i have a similarity of zero.
+        average_differences = np.divide(
+            difference_totals,
+            counts,
+            out=np.zeros(len(counts)),
+            where=counts > 0,
+        )
+        row = np.where(counts > 0, 1 - average_differences / 4.5, 0.0)
+
+        # Adds the row to self.S, doubling the number of rows it can hold whenever it is full.
+        if self.similarity_count == len(self.S):
+            self.reserve_similarity_rows(max(2 * len(self.S), 16))
+        self.S[self.similarity_count] = row
+        self.similarity_slots[i] = self.similarity_count
+        self.similarity_count += 1
+
+    def reserve_similarity_rows(self, capacity):
+        """
+        Makes room in self.S for capacity rows of similarities, up
+        to one row per movie. Only the rows in use are copied over.
+        """
+        capacity = min(capacity, len(self.similarity_slots))
+        if capacity <= len(self.S):
+            return
+        S = np.empty((capacity, len(self.similarity_slots)), dtype=np.float32)
+        S[: self.similarity_count] = self.S[: self.similarity_count]
+        self.S = S
+
+    def similarity_row(self, i):
+        """
+        Returns the similarities between the movie in column i of
+        the ratings matrix and every movie, computing them first
+        if they have not been computed yet.
+        """
+        if self.similarity_slots[i] < 0:
+            self.compute_similarity_row(i)
+        return self.S[self.similarity_slots[i]]
+
+    def compute_similarity_rows(self, columns):
+        """
+        Computes the rows of similarities for the movies in the given
+        columns of the ratings matrix that have not been computed yet.
+        """
+        for i in np.unique(columns):
+            if self.similarity_slots[i] < 0:
+                self.compute_similarity_row(i)
+
+    def compute_all_similarities(self):
+        """
+        Computes every row of similarities ahead of time, so that no
+        similarities are computed while predicting ratings. This
+        fills the whole movies x movies similarity matrix at 4 bytes
+        per pair, which is about 362 MB for the shipped movies.csv.
+        """
+        self.reserve_similarity_rows(len(self.movie_index))
+        self.compute_similarity_rows(np.arange(len(self.movie_index)))
+
+    def get_similarity(self, i, j):
+        """
+        Returns the similarity between the movies in columns i and j
+        of the ratings matrix. If neither movie's row of similarities
+        has been computed, movie i's row is computed first.
+        """
+        if self.similarity_slots[j] >= 0:
+            return float(self.S[self.similarity_slots[j], i])
+        return float(self.similarity_row(i)[j])
+
     def correlation(self, predicted_ratings, actual_ratings):
         """
         Returns the correlation between the values in the list predicted_ratings
         and the list actual_ratings.  The lengths of predicted_ratings and
         actual_ratings must be the same.
         """
-        return pearsonr(predicted_ratings, actual_ratings)[0]
+        # Computes the Pearson correlation coefficient directly from the deviations from each list's mean.
+        predicted_deviations = np.asarray(predicted_ratings, dtype=np.float64)
+        predicted_deviations = predicted_deviations - predicted_deviations.mean()
+        actual_deviations = np.asarray(actual_ratings, dtype=np.float64)
+        actual_deviations = actual_deviations - actual_deviations.mean()
+        return float(
+            np.dot(predicted_deviations, actual_deviations)
+            / np.sqrt(
+                np.dot(predicted_deviations, predicted_deviations)
+                * np.dot(actual_deviations, actual_deviations)
+            )
+        )
 
 
 class Movie:
@@ -150,7 +427,10 @@ class Movie:
     Represents a movie from the movie database.
     """
 
-    def __init__(self, id, title):
+    # There is one Movie object per movie in the database, so they are given fixed slots instead of a __dict__.
+    __slots__ = ("id", "title", "users", "similarities", "recommender", "index")
+
+    def __init__(self, id, title, recommender=None, index=None):
         """
         Constructor.
         Initializes the following instances variables.  You
@@ -158,21 +438,31 @@ class Movie:
         variables.  (For testing purposes.)
         id: the id of the movie
         title: the title of the movie
-        users: list of the id's of the users who have
+        users: set of the id's of the users who have
             rated this movie.  Initially, this is
-            an empty list, but will be filled in
+            an empty set, but will be filled in
             as the training ratings file is read.
-        similarities: a dictionary where the key is the
+        similarities: a mapping where the key is the
             id of another movie, and the value is the similarity
             between the "self" movie and the movie with that id.
-            This dictionary is initially empty.  It is filled
-            in "on demand", as the file containing test ratings
-            is read, and ratings predictions are made.
+            This mapping is initially empty.  It is a view of the
+            recommender's similarity matrix (see Movie_Similarities),
+            so no similarities are stored on the movie itself.  A
+            movie created without a recommender gets an empty
+            dictionary instead, and cannot compute similarities.
+        recommender: the Movie_Recommendations object that
+            holds the ratings matrix.
+        index: the column of this movie in the ratings matrix.
         """
         self.id = id
         self.title = str(title)
-        self.users = []
-        self.similarities = {}
+        self.users = set()
+        if recommender is None:
+            self.similarities = {}
+        else:
+            self.similarities = Movie_Similarities(recommender, index)
+        self.recommender = recommender
+        self.index = index
 
     def __str__(self):
         """
@@ -184,98 +474,124 @@ class Movie:
     def __repr__(self):
         """
         Returns string representation of the movie object.
+        Only the number of similarities is shown, since a computed
+        row holds a similarity for every other movie.
         """
-        return f"Movie ID- {self.id} Movie Title- {self.title} Users- {self.users} Similarities- {self.similarities}"
+        return f"Movie ID- {self.id} Movie Title- {self.title} Users- {self.users} Similarities- {len(self.similarities)}"
+
+    def check_recommender(self):
+        """
+        Raises ValueError if the movie was created without a
+        recommender, since similarities are computed from the
+        recommender's ratings matrix.
+        """
+        if self.recommender is None:
+            raise ValueError(
+                f"Movie {self.id} has no recommender to compute similarities with."
+            )
 
     def get_similarity(self, other_movie_id, movie_dict, user_dict):
         """
         Returns the similarity between the movie that
         called the method (self), and another movie whose
         id is other_movie_id.  (Uses movie_dict and user_dict)
-        If the similarity has already been computed, return it.
-        If not, compute the similarity (using the compute_similarity
-        method), and store it in both
-        the "self" movie object, and the other_movie_id movie object.
-        Then return that computed similarity.
+        The similarity is looked up in the recommender's similarity
+        matrix, which computes it on demand and shares it between
+        the "self" movie object and the other_movie_id movie object.
         If other_movie_id is not valid, raise BadInputError exception.
+        If the movie has no recommender, raise ValueError exception.
         """
-        try:
-            # Checks to see if the similarity has already been computed. If it has been, it returns the similarity computation that is
-            # stored in the movie object's similarity dictionary which maps other movies the user has seen to the similarity that was
-            # computed with respect to the movie object.
-            if other_movie_id in movie_dict:
-                if other_movie_id in self.similarities:
-                    return self.similarities[other_movie_id]
-                # If the similarity has not been calculated, it calls compute similiality, stores this calculation in the movie object's
-                # similarity dictionary as well as stores this calculation in the other movie's object similarity dictionary for perhaps
-                # later, and lastly returns the similarity calculation.
-                else:
-                    similarity = self.compute_similarity(
-                        other_movie_id, movie_dict, user_dict
-                    )
-                    self.similarities[other_movie_id] = similarity
-                    movie_dict[other_movie_id].similarities[self.id] = similarity
-                    return similarity
-            # If the other movie id is not valid, raises bad input exception.
-            else:
-                raise BadInputError
-        except BadInputError:
-            print("The other_movie_id is not valid.")
+        self.check_recommender()
+
+        # If the other movie id is not valid, raises bad input exception.
+        other_movie = movie_dict.get(other_movie_id)
+        if other_movie is None:
+            raise BadInputError
+
+        return self.recommender.get_similarity(self.index, other_movie.index)
 
     def compute_similarity(self, other_movie_id, movie_dict, user_dict):
         """
         Computes and returns the similarity between the movie that
         called the method (self), and another movie whose
-        id is other_movie_id.  (Uses movie_dict and user_dict)
+        id is other_movie_id.  (Uses movie_dict to find the other
+        movie's column in the ratings matrix.)
+        If the movie has no recommender, raise ValueError exception.
+        """
+        self.check_recommender()
+        return self.recommender.compute_similarity(
+            self.index, movie_dict[other_movie_id].index
+        )
 
+
+class Movie_Similarities(Mapping):
+    """
+    Represents the known similarities between a movie and other
+    movies, as a read-only mapping from movie ids to similarities
+    backed by the recommender's similarity matrix.
+    Similarities are computed a whole row at a time. Once the
+    movie's own row has been computed, the mapping holds every
+    other movie. Until then, it holds the movies whose rows have
+    been computed. The movie itself is never included.
+    """
+
+    __slots__ = ("recommender", "index")
+
+    def __init__(self, recommender, index):
         """
-        # Initializes a list for the user ratings for the movie that called the method (self).
-        init_movie_ratings = []
-        # Initializes a list for the user ratings for the other movie.
-        other_movie_ratings = []
-        # Initialzes a list to hold all of the absolute difference calcuations for the user ratings.
-        absolute_difference = []
-
-        # Creates list of users who have seen the __init__ movie.
-        init_movie_users = movie_dict[self.id].users
-        # Creates list of users who have seen the other movie.
-        other_movie_users = movie_dict[other_movie_id].users
-
-        # Initializes a list for users who viewed both the __init__ movie and the other movie and appends to the list by iterating over
-        # init_movie_users and checking if each user is also in the other_movie_users list.
-        users_who_viewed_both = []
-        for user in init_movie_users:
-            if user in other_movie_users:
-                users_who_viewed_both.append(user)
-
-        # Returns similarity value of zero if no user viewed both movies.
-        if len(users_who_viewed_both) == 0:
-            similarity = 0.0
-            return similarity
-        else:
-            # For all users who have seen both movies, it appends the user rating for the __init__ movie into the init_movie_ratings list.
-            for user in users_who_viewed_both:
-                init_rating = user_dict[user]
-                init_rating = init_rating[self.id]
-                init_movie_ratings.append(init_rating)
-                # For all users who have seen both movies, it appends the user rating for the other movie into the other_movie_ratings list.
-                other_rating = user_dict[user]
-                other_rating = other_rating[other_movie_id]
-                other_movie_ratings.append(other_rating)
-
-            # Calculates the absolute difference between the ratings in the init_movie_ratings list from the ratings in the
-            # other_movie_ratings list and appends each calculation into the absolute difference list.
-            for i, init_rating in enumerate(init_movie_ratings):
-                absolute_difference.append(abs(init_rating - other_movie_ratings[i]))
-
-            # Sums the absolute diffenece calculations together and divides by the total number of calcualtions to find the average difference.
-            absolute_difference_total = sum(absolute_difference)
-            average_difference = absolute_difference_total / len(init_movie_ratings)
-
-            # Linear Equation to calculate the weighted similarity value using the average diffence.
-            similarity = 1 - average_difference / 4.5
-
-            return float(similarity)
+        Constructor.
+        recommender: the Movie_Recommendations object that
+            holds the similarity matrix.
+        index: the column of the movie in the ratings matrix.
+        """
+        self.recommender = recommender
+        self.index = index
+
+    def __getitem__(self, other_movie_id):
+        """
+        Returns the similarity with the movie whose id is
+        other_movie_id, if it is known.
+        """
+        # A similarity is known if either movie's row of the similarity matrix has been computed.
+        other_index = self.recommender.movie_index[other_movie_id]
+        if other_index == self.index:
+            raise KeyError(other_movie_id)
+        slots = self.recommender.similarity_slots
+        if slots[self.index] >= 0:
+            return float(self.recommender.S[slots[self.index], other_index])
+        if slots[other_index] >= 0:
+            return float(self.recommender.S[slots[other_index], self.index])
+        raise KeyError(other_movie_id)
+
+    def __iter__(self):
+        """
+        Iterates over the ids of the movies whose similarity with
+        this movie is known.
+        """
+        if self.recommender.similarity_slots[self.index] >= 0:
+            movie_id = self.recommender.movie_ids[self.index]
+            return (
+                other_movie_id
+                for other_movie_id in self.recommender.movie_index
+                if other_movie_id != movie_id
+            )
+        computed = np.flatnonzero(self.recommender.similarity_slots >= 0)
+        return iter(self.recommender.movie_ids[computed].tolist())
+
+    def __len__(self):
+        """
+        Returns the number of movies whose similarity with this
+        movie is known.
+        """
+        if self.recommender.similarity_slots[self.index] >= 0:
+            return len(self.recommender.movie_index) - 1
+        return self.recommender.similarity_count
+
+    def __repr__(self):
+        """
+        Returns string representation of the similarities.
+        """
+        return repr(dict(self))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,247 @@
+# File: test_recommendations.py
+# Description: Checks that the batched and single rating predictions
+#              agree, that ratings files are read correctly, that
+#              invalid ids and ratings are rejected, and
+#              that precomputed and viewed similarities match computed ones.
+
+import csv
+import os
+import tempfile
+import warnings
+
+import numpy as np
+
+import movie_recommendations
+
+DATA_SETS = (
+    ("dummy_movies.csv", "dummy_training_ratings.csv", "dummy_test_ratings.csv"),
+    ("movies.csv", "training_ratings.csv", "test_ratings.csv"),
+)
+
+
+def write_file(lines):
+    """
+    Writes a csv file with the given lines, and returns its name.
+    """
+    csv_file = tempfile.NamedTemporaryFile(
+        "w", suffix=".csv", delete=False, encoding="utf-8"
+    )
+    for line in lines:
+        csv_file.write(line + "\n")
+    csv_file.close()
+    return csv_file.name
+
+
+def write_ratings(lines):
+    """
+    Writes a ratings file with a header and the given lines,
+    and returns its name.
+    """
+    return write_file(["userId,movieId,rating,timestamp"] + lines)
+
+
+def test_predict_ratings_matches_predict_rating():
+    for movie_filename, training_filename, test_filename in DATA_SETS:
+        mr = movie_recommendations.Movie_Recommendations(
+            movie_filename, training_filename
+        )
+        predicted_ratings = mr.predict_ratings(test_filename)
+
+        test_file = open(test_filename, "r", encoding="utf-8")
+        lines = [line for line in csv.reader(test_file) if line[0] != "userId"]
+        test_file.close()
+
+        assert len(predicted_ratings) == len(lines)
+        for prediction, line in zip(predicted_ratings, lines):
+            assert prediction[2] == mr.predict_rating(int(line[0]), int(line[1]))
+
+
+def test_predict_ratings_invalid_id():
+    mr = movie_recommendations.Movie_Recommendations(
+        "dummy_movies.csv", "dummy_training_ratings.csv"
+    )
+    for line in ("20,1,4,190000000", "2,30,4,190000000"):
+        test_filename = write_ratings(["2,1,5,190000005", line])
+        try:
+            mr.predict_ratings(test_filename)
+        except movie_recommendations.BadInputError:
+            pass
+        else:
+            raise AssertionError(f"{line} should have raised BadInputError")
+        finally:
+            os.remove(test_filename)
+
+
+def test_invalid_ratings():
+    for rating in ("3.25", "5.5"):
+        training_filename = write_ratings(
+            ["1,1,4,190000000", f"1,2,{rating},190000001"]
+        )
+        try:
+            movie_recommendations.Movie_Recommendations(
+                "dummy_movies.csv", training_filename
+            )
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"a rating of {rating} should have raised ValueError")
+        finally:
+            os.remove(training_filename)
+
+
+def test_load_ratings_without_header():
+    ratings_filename = write_file(["1,1,4,190000000", "2,3,0.5,190000001"])
+    try:
+        user_ids, movie_ids, ratings = movie_recommendations.load_ratings(
+            ratings_filename
+        )
+    finally:
+        os.remove(ratings_filename)
+    assert user_ids.tolist() == [1, 2]
+    assert movie_ids.tolist() == [1, 3]
+    assert ratings.tolist() == [4.0, 0.5]
+
+
+def test_load_ratings_invalid_id():
+    for line in ("1,12.7,4,190000000", "1.5,1,4,190000000"):
+        ratings_filename = write_ratings([line])
+        try:
+            movie_recommendations.load_ratings(ratings_filename)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{line} should have raised ValueError")
+        finally:
+            os.remove(ratings_filename)
+
+
+def test_load_ratings_header_only():
+    ratings_filename = write_ratings([])
+    try:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            user_ids, movie_ids, ratings = movie_recommendations.load_ratings(
+                ratings_filename
+            )
+    finally:
+        os.remove(ratings_filename)
+    assert caught == []
+    assert len(user_ids) == len(movie_ids) == len(ratings) == 0
+
+
+def test_compute_all_similarities():
+    mr = movie_recommendations.Movie_Recommendations(
+        "dummy_movies.csv", "dummy_training_ratings.csv"
+    )
+    mr.compute_all_similarities()
+    assert (mr.similarity_slots >= 0).all()
+    movie_count = len(mr.movie_index)
+    for i in range(movie_count):
+        for j in range(movie_count):
+            assert mr.similarity_row(i)[j] == np.float32(mr.compute_similarity(i, j))
+
+
+def test_repeated_movie_id():
+    movie_filename = write_file(
+        ["movieId,title,genres", "1,M1,Comedy", "2,M2,Comedy", "1,M3,Comedy"]
+    )
+    training_filename = write_ratings(
+        ["1,1,4,190000000", "1,2,3,190000001", "2,1,5,190000002"]
+    )
+    try:
+        mr = movie_recommendations.Movie_Recommendations(
+            movie_filename, training_filename
+        )
+    finally:
+        os.remove(movie_filename)
+        os.remove(training_filename)
+    assert mr.movie_index == {1: 0, 2: 1}
+    assert mr.movie_dict[1].title == "M3"
+    assert mr.movie_dict[1].index == 0
+    assert mr.ratings.shape == (2, 2)
+    assert mr.predict_rating(2, 2) == 5.0
+
+
+def test_movie_without_recommender():
+    movie = movie_recommendations.Movie(1, "M1")
+    assert movie.similarities == {}
+    for method in (movie.get_similarity, movie.compute_similarity):
+        try:
+            method(2, {}, {})
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{method.__name__} should have raised ValueError")
+
+
+def test_movie_similarities():
+    mr = movie_recommendations.Movie_Recommendations(
+        "dummy_movies.csv", "dummy_training_ratings.csv"
+    )
+    md = mr.movie_dict
+    movie_count = len(md)
+
+    def expected(movie_id, other_movie_id):
+        return np.float32(
+            mr.compute_similarity(md[movie_id].index, md[other_movie_id].index)
+        )
+
+    # Nothing is known before any row has been computed.
+    assert md[1].similarities == {}
+    assert len(md[1].similarities) == 0
+
+    # Computes movie 1's row. Movie 1 then knows every other movie, but not itself.
+    md[1].get_similarity(2, md, mr.user_dict)
+    similarities = md[1].similarities
+    assert set(similarities) == {2, 3, 4, 5}
+    assert len(similarities) == movie_count - 1 == len(list(similarities))
+    assert 1 not in similarities
+    try:
+        similarities[1]
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("a movie should not have a similarity with itself")
+    for other_movie_id in similarities:
+        assert similarities[other_movie_id] == expected(1, other_movie_id)
+
+    # The other movies only know movie 1, read from movie 1's row.
+    for movie_id in (2, 3, 4, 5):
+        similarities = md[movie_id].similarities
+        assert dict(similarities) == {1: expected(movie_id, 1)}
+        assert len(similarities) == mr.similarity_count == 1
+
+    # Computes movie 2's row. Movie 3 then knows movies 1 and 2.
+    md[2].get_similarity(3, md, mr.user_dict)
+    similarities = md[3].similarities
+    assert set(similarities) == {1, 2}
+    assert len(similarities) == mr.similarity_count == 2 == len(list(similarities))
+    assert similarities[2] == expected(3, 2)
+    assert set(md[2].similarities) == {1, 3, 4, 5}
+
+    # Unknown movie ids are missing keys, so in and get still work.
+    assert 99 not in md[1].similarities
+    assert md[1].similarities.get(99) is None
+    try:
+        md[1].similarities[99]
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("an unknown movie id should raise KeyError")
+
+
+if __name__ == "__main__":
+    for test in (
+        test_predict_ratings_matches_predict_rating,
+        test_predict_ratings_invalid_id,
+        test_invalid_ratings,
+        test_load_ratings_without_header,
+        test_load_ratings_invalid_id,
+        test_load_ratings_header_only,
+        test_compute_all_similarities,
+        test_repeated_movie_id,
+        test_movie_without_recommender,
+        test_movie_similarities,
+    ):
+        test()
+        print(f"{test.__name__} passed")